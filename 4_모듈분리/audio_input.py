@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+import shutil
+import tempfile
+import logging
+import subprocess
+import numpy as np
+from pydub import AudioSegment
+
+_SAMPLE_WIDTH = 2  # 16-bit PCM
+
+
+class DecodedAudio:
+    """
+    16kHz 모노 16-bit PCM으로 디코딩된 오디오.
+    한 번의 디코딩 결과를 화자 분리와 세그먼트 추출에 함께 사용합니다.
+    """
+
+    def __init__(self, samples, sample_rate):
+        self.samples = samples
+        self.sample_rate = sample_rate
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+    def as_pyannote_input(self):
+        """
+        pyannote 파이프라인에 바로 넣을 수 있는 {"waveform", "sample_rate"} 입력을 만듭니다.
+        float32 사본은 하나만 만들고 정규화는 그 사본 안에서 처리합니다.
+        """
+        import torch
+
+        waveform = torch.from_numpy(self.samples).float().div_(32768.0).unsqueeze(0)
+        return {"waveform": waveform, "sample_rate": self.sample_rate}
+
+    def segment(self, start, end):
+        """
+        start~end(초) 구간을 pydub AudioSegment로 잘라 반환합니다.
+        """
+        start_index = max(0, int(start * self.sample_rate))
+        end_index = min(len(self.samples), int(end * self.sample_rate))
+        return AudioSegment(
+            data=self.samples[start_index:end_index].tobytes(),
+            sample_width=_SAMPLE_WIDTH,
+            frame_rate=self.sample_rate,
+            channels=1,
+        )
+
+
+def _probe_duration(audio_path):
+    """
+    ffprobe로 오디오 길이(초)를 구합니다. 알 수 없으면 None을 반환합니다.
+    """
+    if shutil.which("ffprobe") is None:
+        return None
+    command = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        audio_path,
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=60)
+        return float(result.stdout.strip())
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+
+def decode_audio(audio_path, sample_rate=16000, chunk_seconds=10):
+    """
+    ffmpeg로 오디오 파일(wav, m4a, mp3, webm 등)을 스트리밍 디코딩합니다.
+    출력은 ffmpeg에서 바로 16kHz 모노로 변환되며, chunk_seconds 단위로 읽어 들입니다.
+    ffprobe로 구한 길이만큼 샘플 버퍼를 미리 잡아 두고 그 안에 바로 읽어 들이므로,
+    디코딩 중 메모리는 최종 int16 샘플 크기를 크게 넘지 않습니다.
+    디코딩 처리량(오디오 초/초)을 로그로 남깁니다.
+    """
+    if not os.path.exists(audio_path):
+        logging.error(f"오디오 파일을 찾을 수 없습니다: {audio_path}")
+        return None
+    if shutil.which("ffmpeg") is None:
+        logging.error("ffmpeg를 찾을 수 없습니다. ffmpeg를 설치한 뒤 PATH에 추가해주세요.")
+        return None
+
+    logging.info(f"오디오 디코딩을 시작합니다: {audio_path}")
+    command = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-i", audio_path,
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ac", "1", "-ar", str(sample_rate),
+        "pipe:1",
+    ]
+    chunk_samples = int(chunk_seconds * sample_rate)
+    chunk_bytes = chunk_samples * _SAMPLE_WIDTH
+    # 길이를 알 수 없거나 실제 길이가 더 길면 버퍼를 1.5배씩 늘립니다.
+    duration = _probe_duration(audio_path)
+    capacity = int((duration or chunk_seconds) * sample_rate) + chunk_samples
+    samples = np.empty(capacity, dtype=np.int16)
+    filled_bytes = 0
+    decode_start_time = time.time()
+    try:
+        # stderr를 파이프로 받으면 손상된 파일에서 오류 로그가 파이프 버퍼를 채워
+        # ffmpeg와 stdout 읽기가 서로를 기다리며 멈출 수 있으므로 임시 파일로 받습니다.
+        with tempfile.TemporaryFile() as stderr_file:
+            with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file) as process:
+                buffer = memoryview(samples.view(np.uint8))
+                while True:
+                    if filled_bytes + chunk_bytes > len(buffer):
+                        buffer.release()
+                        samples.resize(int(len(samples) * 1.5) + chunk_samples, refcheck=False)
+                        buffer = memoryview(samples.view(np.uint8))
+                    read_bytes = process.stdout.readinto(buffer[filled_bytes:filled_bytes + chunk_bytes])
+                    if not read_bytes:
+                        break
+                    filled_bytes += read_bytes
+                buffer.release()
+                return_code = process.wait()
+            stderr_file.seek(0)
+            error_output = stderr_file.read().decode("utf-8", errors="replace").strip()
+    except OSError as e:
+        logging.error(f"오디오 디코딩 중 오류 발생: {e}")
+        return None
+
+    if return_code != 0:
+        logging.error(f"오디오 디코딩 중 오류 발생 (ffmpeg 종료 코드 {return_code}): {error_output}")
+        return None
+
+    # 남는 버퍼를 돌려주고, 홀수 바이트가 남는 경우를 대비해 샘플 단위로 자릅니다.
+    samples.resize(filled_bytes // _SAMPLE_WIDTH, refcheck=False)
+    decoded = DecodedAudio(samples, sample_rate)
+
+    elapsed = time.time() - decode_start_time
+    throughput = decoded.duration / elapsed if elapsed > 0 else float("inf")
+    logging.info(f"오디오 디코딩 완료. (길이: {decoded.duration:.2f}초, 처리 시간: {elapsed:.2f}초, 처리량: {throughput:.1f} 오디오초/초)")
+    return decoded
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import sys
+import time
+import logging
+import argparse
+import torch
+from pyannote.core import Segment, Timeline
+from pyannote.metrics.diarization import DiarizationErrorRate
+
+from test05.config import DIARIZATION_PROFILES, DIARIZATION_NUM_THREADS, AUDIO_SAMPLE_RATE, DECODE_CHUNK_SECONDS
+from test05.api_keys import load_api_keys
+from test05.audio_input import DecodedAudio, decode_audio
+from test05.diarization import load_diarization_pipeline, diarize_audio
+
+# 모델 초기화 비용이 첫 프로필의 측정값에 섞이지 않도록 먼저 짧게 실행해 둘 길이(초)
+_WARMUP_SECONDS = 30
+_REFERENCE_PROFILE = "accurate"
+
+
+def calibrate(pipeline, audio, profile_names):
+    """
+    기준 녹음 하나로 각 프로필의 실시간 배율(RTF)과 accurate 프로필 대비 라벨 일치율을 측정합니다.
+    일치율은 accurate 결과를 기준으로 한 (1 - DER)이며, 라벨 이름은 최적 매칭으로 맞춥니다.
+    """
+    warmup = DecodedAudio(audio.samples[:_WARMUP_SECONDS * audio.sample_rate], audio.sample_rate)
+    diarize_audio(warmup.as_pyannote_input(), None, pipeline=pipeline)
+
+    # 기준이 되는 accurate 프로필을 먼저 실행합니다.
+    ordered = sorted(profile_names, key=lambda name: name != _REFERENCE_PROFILE)
+    if _REFERENCE_PROFILE not in ordered:
+        ordered.insert(0, _REFERENCE_PROFILE)
+
+    results = []
+    reference = None
+    uem = Timeline([Segment(0, audio.duration)])
+    for name in ordered:
+        logging.info(f"프로필 '{name}'로 화자 분리를 실행합니다...")
+        start_time = time.time()
+        diarization = diarize_audio(audio.as_pyannote_input(), None, pipeline=pipeline, profile=DIARIZATION_PROFILES[name])
+        elapsed = time.time() - start_time
+        if diarization is None:
+            logging.error(f"프로필 '{name}' 실행에 실패했습니다.")
+            continue
+
+        if name == _REFERENCE_PROFILE:
+            reference = diarization
+        agreement = None
+        if reference is not None:
+            der = DiarizationErrorRate()(reference, diarization, uem=uem)
+            agreement = max(0.0, 1.0 - der)
+        results.append({
+            "profile": name,
+            "seconds": elapsed,
+            "real_time_factor": elapsed / audio.duration,
+            "speakers": len(diarization.labels()),
+            "agreement": agreement,
+        })
+    return results
+
+
+def main(argv=None):
+    """
+    화자 분리 프로필 보정 CLI.
+    예) python -m test05.calibrate_diarization data/기준회의.m4a --profiles fast balanced
+    """
+    parser = argparse.ArgumentParser(description="화자 분리 프로필별 속도와 정확도를 측정합니다.")
+    parser.add_argument("audio_path", help="기준 녹음 파일")
+    parser.add_argument("--profiles", nargs="+", default=list(DIARIZATION_PROFILES), choices=list(DIARIZATION_PROFILES),
+                        help="측정할 프로필")
+    args = parser.parse_args(argv)
+
+    _, pyannote_token = load_api_keys()
+    if not pyannote_token:
+        return 1
+    pipeline = load_diarization_pipeline(pyannote_token, DIARIZATION_NUM_THREADS)
+    if pipeline is None:
+        return 1
+    audio = decode_audio(args.audio_path, AUDIO_SAMPLE_RATE, DECODE_CHUNK_SECONDS)
+    if audio is None:
+        return 1
+
+    results = calibrate(pipeline, audio, args.profiles)
+    print(f"기준 녹음: {args.audio_path} ({audio.duration:.1f}초), 스레드 {torch.get_num_threads()}개")
+    print(f"{'프로필':<10} {'처리 시간(초)':>12} {'RTF':>8} {'화자 수':>8} {f'{_REFERENCE_PROFILE} 일치율':>16}")
+    for result in results:
+        agreement = f"{result['agreement'] * 100:.1f}%" if result["agreement"] is not None else "-"
+        print(f"{result['profile']:<10} {result['seconds']:>12.1f} {result['real_time_factor']:>8.3f} "
+              f"{result['speakers']:>8} {agreement:>16}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
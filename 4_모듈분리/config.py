@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import os
 
 # --- 공통 설정 ---
 
@@ -14,3 +15,104 @@ AUDIO_FILE_PATH = "C:/Users/SBA/github/Minute/data/20250923_script2.wav"
 
 # 임시 파일명
 TEMP_SEGMENT_FILENAME = "temp_segment.wav"
+
+# 전체 회의 검색용 결과 저장소(SQLite) 파일명 (결과 디렉터리 아래에 만듭니다)
+RESULTS_DB_FILENAME = "results.db"
+RESULTS_DB_PATH = os.path.join(RESULTS_DIR, RESULTS_DB_FILENAME)
+
+# 회의 간 화자 식별 색인 파일명(결과 디렉터리 아래에 만듭니다) 및 코사인 유사도 임계값
+SPEAKER_INDEX_FILENAME = "speaker_index.npz"
+SPEAKER_INDEX_PATH = os.path.join(RESULTS_DIR, SPEAKER_INDEX_FILENAME)
+SPEAKER_MATCH_THRESHOLD = 0.7
+
+# 식별된 화자의 임베딩을 색인에 자동 추가하는 조건
+# (식별 임계값보다 높은 유사도에서만, 한 사람당 최대 개수까지. None이면 enroll CLI로만 등록)
+SPEAKER_AUTO_ENROLL_THRESHOLD = 0.85
+SPEAKER_MAX_EMBEDDINGS_PER_PERSON = 20
+
+# 오디오 디코딩 설정 (16kHz 모노로 변환, 청크 단위 스트리밍 디코딩)
+AUDIO_SAMPLE_RATE = 16000
+DECODE_CHUNK_SECONDS = 10
+
+# 서비스 모드 설정 (python -m test05.service)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8000
+# 워커가 여러 개여도 화자 분리(공유 파이프라인)와 화자 색인 갱신은 한 번에 하나씩 처리됩니다.
+SERVICE_WORKERS = 1
+SERVICE_QUEUE_SIZE = 8
+UPLOAD_DIR = "uploads"
+
+# 완료된 작업 보관 정책: 보관 시간(초)과 최대 개수를 넘으면 오래된 작업부터 메모리에서 지웁니다.
+# 업로드된 오디오는 작업이 끝나면 지우며, SERVICE_KEEP_UPLOADS가 True이면 UPLOAD_DIR에 남깁니다.
+SERVICE_JOB_TTL_SECONDS = 3600
+SERVICE_MAX_FINISHED_JOBS = 100
+SERVICE_KEEP_UPLOADS = False
+
+# LLM 교정/요약 응답을 스트리밍으로 받아 도착하는 대로 출력할지 여부
+LLM_STREAMING = True
+
+# LLM 모델 설정 (단계별)
+#   correction_fast: 교정 청크를 먼저 보내는 빠른 모델
+#   correction_strong: 로컬 검사에 실패한 청크를 다시 보내는 상위 모델
+#   summary: 회의 요약 모델
+LLM_MODELS = {
+    "correction_fast": "gpt-4o-mini",
+    "correction_strong": "gpt-4",
+    "summary": "gpt-4",
+}
+
+# 교정 모델 라우팅 설정
+# 라우팅을 켜면 교정 결과는 토큰 단위가 아니라 로컬 검사를 마친 청크 단위로 출력됩니다.
+# (LLM_STREAMING은 교정 단계에서는 첫 토큰까지의 시간 측정에만 쓰입니다.)
+CORRECTION_ROUTING = True
+CORRECTION_CHUNK_LINES = 40
+CORRECTION_MAX_EDIT_RATIO = 0.5
+# 상위 모델의 교정 처리 시간(1000자당 초)의 대략적인 값. 상위 모델로 보낸 청크가 없을 때
+# 절약 시간 추정(correction_latency_saved_seconds_estimated)에만 쓰이며, 실측값으로 바꿔 쓰는 것을 권장합니다.
+CORRECTION_STRONG_SECONDS_PER_1K_CHARS = 20.0
+
+# 화자 분리 torch intra-op 스레드 수. 프로세스 전체에 적용되므로 파이프라인을 불러올 때 한 번만 설정합니다.
+# None이면 torch 기본값(물리 코어 수)을 사용합니다. SMT 논리 코어까지 쓰면 CPU 추론이 오히려 느려지는 경우가 많으므로,
+# 컨테이너 CPU 할당량이 물리 코어보다 적을 때만 그 수로 낮춰 지정하세요.
+DIARIZATION_NUM_THREADS = None
+
+# 화자 분리 프로필 (CPU 전용 서버용 속도/정확도 설정)
+#   num_speakers / min_speakers / max_speakers: 화자 수 힌트 (None이면 자동 추정, 참석자 수를 알 때만 지정)
+#   segmentation_step: 분할 창(10초)을 옮기는 간격의 창 길이 대비 비율 (3.1 기본값 0.1).
+#                      간격이 넓을수록 분할/임베딩 계산량이 그만큼 줄어 빨라지지만 화자 전환 경계와 라벨이 덜 정확해집니다.
+#   segmentation_batch_size / embedding_batch_size: 분할/임베딩 모델 배치 크기 (속도/메모리에만 영향, 라벨은 같음)
+#   clustering_threshold: 화자 군집화 임계값 (파이프라인을 공유하므로 프로필마다 명시합니다)
+# accurate는 보정 기준이므로 사전 학습된 3.1 모델 설정 그대로(힌트 없음, 기본 간격/배치/임계값) 둡니다.
+# 작업별로 고르려면 python -m test05.main --profile fast 또는 서비스 요청의 "profile" 값을 사용하세요.
+# 워크로드별 선택은 python -m test05.calibrate_diarization <기준 녹음> 결과를 참고하세요.
+DIARIZATION_PRETRAINED_THRESHOLD = 0.7045654963945799
+DIARIZATION_PROFILE = "balanced"
+DIARIZATION_PROFILES = {
+    "fast": {
+        "num_speakers": None,
+        "min_speakers": None,
+        "max_speakers": None,
+        "segmentation_step": 0.3,
+        "segmentation_batch_size": 64,
+        "embedding_batch_size": 64,
+        "clustering_threshold": DIARIZATION_PRETRAINED_THRESHOLD,
+    },
+    "balanced": {
+        "num_speakers": None,
+        "min_speakers": None,
+        "max_speakers": None,
+        "segmentation_step": 0.2,
+        "segmentation_batch_size": 32,
+        "embedding_batch_size": 32,
+        "clustering_threshold": DIARIZATION_PRETRAINED_THRESHOLD,
+    },
+    "accurate": {
+        "num_speakers": None,
+        "min_speakers": None,
+        "max_speakers": None,
+        "segmentation_step": 0.1,
+        "segmentation_batch_size": 32,
+        "embedding_batch_size": 32,
+        "clustering_threshold": DIARIZATION_PRETRAINED_THRESHOLD,
+    },
+}
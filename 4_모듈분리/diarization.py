@@ -1,22 +1,73 @@
 # -*- coding: utf-8 -*-
 import os
 import logging
+import threading
+import torch
 from pyannote.audio import Pipeline
 
-def diarize_audio(audio_path, token):
+_SPEAKER_HINTS = ("num_speakers", "min_speakers", "max_speakers")
+# 서비스 모드에서 여러 작업이 파이프라인 하나를 공유하므로, 프로필 적용과 실행을 한 번에 하나씩 처리합니다.
+_PIPELINE_LOCK = threading.Lock()
+
+def apply_diarization_profile(pipeline, profile):
+    """
+    화자 분리 프로필(config.DIARIZATION_PROFILES 항목)을 파이프라인에 적용합니다.
+    분할 창 간격, 배치 크기, 군집화 임계값을 설정하고, 호출 시 넘길 화자 수 힌트를 반환합니다.
+    torch 스레드 수는 프로세스 전체 설정이므로 여기서 바꾸지 않습니다. (load_diarization_pipeline 참고)
     """
-    pyannote.audio를 사용하여 오디오 파일의 화자를 분리합니다.
+    if profile.get("segmentation_step"):
+        segmentation = pipeline._segmentation
+        segmentation.step = profile["segmentation_step"] * segmentation.duration
+    if profile.get("segmentation_batch_size"):
+        pipeline.segmentation_batch_size = profile["segmentation_batch_size"]
+    if profile.get("embedding_batch_size"):
+        pipeline.embedding_batch_size = profile["embedding_batch_size"]
+    if profile.get("clustering_threshold") is not None:
+        params = pipeline.parameters(instantiated=True)
+        params["clustering"]["threshold"] = profile["clustering_threshold"]
+        pipeline.instantiate(params)
+    return {key: profile[key] for key in _SPEAKER_HINTS if profile.get(key) is not None}
+
+def load_diarization_pipeline(token, num_threads=None):
     """
-    if not os.path.exists(audio_path):
-        logging.error(f"오디오 파일을 찾을 수 없습니다: {audio_path}")
+    pyannote 화자 분리 파이프라인을 불러옵니다.
+    서비스 모드에서는 한 번 불러온 파이프라인을 여러 작업에 재사용합니다.
+    num_threads를 넘기면 torch intra-op 스레드 수를 이때 한 번만 설정합니다.
+    """
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    try:
+        return Pipeline.from_pretrained("pyannote/speaker-diarization-3.1", use_auth_token=token)
+    except Exception as e:
+        logging.error(f"화자 분리 모델 로드 중 오류 발생: {e}")
         return None
+
+def diarize_audio(audio, token, return_embeddings=False, pipeline=None, profile=None):
+    """
+    pyannote.audio를 사용하여 오디오의 화자를 분리합니다.
+    audio는 파일 경로 또는 이미 디코딩된 {"waveform", "sample_rate"} 입력입니다.
+    pipeline을 넘기면 모델을 다시 불러오지 않고 재사용합니다.
+    profile을 넘기면 apply_diarization_profile로 속도/정확도 설정을 적용합니다.
+    return_embeddings가 True이면 (분리 결과, 화자별 임베딩)을 반환합니다.
+    임베딩은 diarization.labels() 순서와 같습니다.
+    공유 파이프라인의 설정이 실행 도중 바뀌지 않도록 프로필 적용부터 실행까지 잠금을 잡습니다.
+    """
+    if isinstance(audio, str) and not os.path.exists(audio):
+        logging.error(f"오디오 파일을 찾을 수 없습니다: {audio}")
+        return (None, None) if return_embeddings else None
     
     logging.info("화자 분리를 시작합니다...")
     try:
-        pipeline = Pipeline.from_pretrained("pyannote/speaker-diarization-3.1", use_auth_token=token)
-        diarization = pipeline(audio_path)
+        if pipeline is None:
+            pipeline = Pipeline.from_pretrained("pyannote/speaker-diarization-3.1", use_auth_token=token)
+        with _PIPELINE_LOCK:
+            speaker_hints = apply_diarization_profile(pipeline, profile) if profile else {}
+            if return_embeddings:
+                diarization, embeddings = pipeline(audio, return_embeddings=True, **speaker_hints)
+            else:
+                diarization = pipeline(audio, **speaker_hints)
         logging.info("화자 분리 완료.")
-        return diarization
+        return (diarization, embeddings) if return_embeddings else diarization
     except Exception as e:
         logging.error(f"화자 분리 중 오류 발생: {e}")
-        return None
+        return (None, None) if return_embeddings else None
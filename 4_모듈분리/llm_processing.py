@@ -1,41 +1,107 @@
 # -*- coding: utf-8 -*-
+import re
+import time
+import difflib
 import logging
 
-def correct_text_with_llm(client, text, topic, keywords):
+def _create_completion(client, model, messages, temperature, stream=False, on_text=None, metrics=None, metric_key=None):
     """
-    LLM을 사용하여 텍스트를 교정합니다.
+    LLM 응답을 받아 전체 텍스트를 반환합니다.
+    stream이 True이면 토큰이 도착할 때마다 on_text를 호출하고,
+    첫 토큰까지 걸린 시간을 metrics[metric_key]에 기록합니다.
+    스트리밍하지 않으면 첫 출력이 곧 전체 응답이므로 응답 전체를 받기까지 걸린 시간을 같은 키에 기록합니다.
     """
-    logging.info("LLM으로 텍스트 교정을 시작합니다...")
-    try:
-        prompt = f"""다음 텍스트는 '{topic}'에 대한 회의 내용입니다. 
+    request_start_time = time.time()
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        stream=stream,
+    )
+    if not stream:
+        if metrics is not None and metric_key:
+            metrics[metric_key] = time.time() - request_start_time
+        return response.choices[0].message.content
+
+    pieces = []
+    for chunk in response:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        if not pieces and metrics is not None and metric_key:
+            metrics[metric_key] = time.time() - request_start_time
+        pieces.append(delta)
+        if on_text:
+            on_text(delta)
+    return "".join(pieces)
+
+def _correction_prompt(text, topic, keywords, numbered=False):
+    prompt = f"""다음 텍스트는 '{topic}'에 대한 회의 내용입니다. 
         주요 키워드는 {', '.join(keywords)} 입니다. 
         문맥에 맞게 문장을 다듬고, 맞춤법 및 띄어쓰기를 수정해주세요. 
         특히, 키워드가 포함된 문장은 더 자연스럽게 만들어주세요.
-
+"""
+    if numbered:
+        prompt += """        각 줄 맨 앞의 [번호]와 화자는 그대로 두고, 줄을 합치거나 나누지 말아주세요.
+"""
+    prompt += f"""
         원본 텍스트:
         {text}
 
         교정된 텍스트:
         """
-        
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
+    return prompt
+
+def correct_text_with_llm(client, text, topic, keywords, stream=False, on_line=None, metrics=None, model="gpt-4"):
+    """
+    LLM을 사용하여 텍스트를 교정합니다.
+    stream이 True이면 응답을 스트리밍으로 받아, 교정된 줄이 완성될 때마다 on_line(줄 번호, 줄)을 호출합니다.
+    줄 번호는 반환값을 strip().split('\\n') 한 결과의 인덱스와 같습니다.
+    """
+    logging.info("LLM으로 텍스트 교정을 시작합니다...")
+    try:
+        prompt = _correction_prompt(text, topic, keywords)
+
+        state = {"pending": "", "line_index": 0}
+
+        def emit_lines(delta):
+            # 응답 앞쪽의 공백은 strip()과 같게 버립니다.
+            if not state["pending"] and state["line_index"] == 0:
+                delta = delta.lstrip()
+            state["pending"] += delta
+            while "\n" in state["pending"]:
+                line, state["pending"] = state["pending"].split("\n", 1)
+                on_line(state["line_index"], line)
+                state["line_index"] += 1
+
+        content = _create_completion(
+            client,
+            model,
+            [
                 {"role": "system", "content": "You are a helpful assistant that corrects and refines meeting transcripts."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
+            stream=stream,
+            on_text=emit_lines if on_line else None,
+            metrics=metrics,
+            metric_key="correction_first_token_seconds",
         )
-        corrected_text = response.choices[0].message.content.strip()
+        if stream and on_line and state["pending"].strip():
+            on_line(state["line_index"], state["pending"])
+        corrected_text = content.strip()
         logging.info("LLM 텍스트 교정 완료.")
         return corrected_text
     except Exception as e:
         logging.error(f"LLM 교정 중 오류 발생: {e}")
         return text # 교정 실패 시 원본 텍스트 반환
 
-def summarize_text(client, text, topic, keywords):
+def summarize_text(client, text, topic, keywords, stream=False, on_token=None, metrics=None, model="gpt-4"):
     """
     LLM을 사용하여 전체 대화 내용을 요약합니다.
+    stream이 True이면 응답을 스트리밍으로 받아, 토큰이 도착할 때마다 on_token을 호출합니다.
     """
     logging.info("LLM으로 회의 요약을 시작합니다...")
     try:
@@ -48,17 +114,157 @@ def summarize_text(client, text, topic, keywords):
 
         회의 요약:
         """
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
+        content = _create_completion(
+            client,
+            model,
+            [
                 {"role": "system", "content": "You are a helpful assistant that summarizes meeting transcripts."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
+            stream=stream,
+            on_text=on_token,
+            metrics=metrics,
+            metric_key="summary_first_token_seconds",
         )
-        summary = response.choices[0].message.content.strip()
+        summary = content.strip()
         logging.info("LLM 회의 요약 완료.")
         return summary
     except Exception as e:
         logging.error(f"LLM 요약 중 오류 발생: {e}")
         return "요약 생성에 실패했습니다."
+
+_NUMBERED_LINE = re.compile(r"^\s*\[(\d+)\]\s?(.*)$")
+
+def _compact(text):
+    return re.sub(r"\s+", "", text)
+
+def _parse_numbered_correction(content, chunk_ids, speakers):
+    """
+    "[번호] 화자: 텍스트" 형식의 교정 결과를 {번호: 교정 텍스트}로 변환합니다.
+    """
+    corrected = {}
+    for line in content.strip().split("\n"):
+        match = _NUMBERED_LINE.match(line)
+        if not match:
+            continue
+        segment_id = int(match.group(1))
+        if segment_id not in chunk_ids or segment_id in corrected:
+            continue
+        body = match.group(2).strip()
+        prefix = f"{speakers[segment_id]}:"
+        if body.startswith(prefix):
+            body = body[len(prefix):].strip()
+        corrected[segment_id] = body
+    return corrected
+
+def _check_correction(chunk_ids, texts, corrected, keywords, max_edit_ratio):
+    """
+    비용이 들지 않는 로컬 검사로 교정 결과를 확인합니다.
+    문제가 있으면 상위 모델로 다시 보낼 이유를, 없으면 None을 반환합니다.
+    """
+    missing = [i for i in chunk_ids if i not in corrected]
+    if missing:
+        return f"누락된 세그먼트 {len(missing)}개"
+
+    source = "\n".join(texts[i] for i in chunk_ids)
+    result = "\n".join(corrected[i] for i in chunk_ids)
+    edit_ratio = 1.0 - difflib.SequenceMatcher(None, source, result, autojunk=False).ratio()
+    if edit_ratio > max_edit_ratio:
+        return f"변경 비율 {edit_ratio:.2f} > {max_edit_ratio:.2f}"
+
+    # 띄어쓰기 교정은 허용하도록 공백을 뺀 상태로 키워드를 비교합니다.
+    compact_source, compact_result = _compact(source), _compact(result)
+    dropped = [k for k in keywords if _compact(k) in compact_source and _compact(k) not in compact_result]
+    if dropped:
+        return f"키워드 누락: {', '.join(dropped)}"
+    return None
+
+def correct_text_routed(client, speakers, texts, topic, keywords, models, chunk_lines, max_edit_ratio,
+                        on_line=None, metrics=None, strong_seconds_per_1k_chars=None, stream=False):
+    """
+    교정을 chunk_lines줄 단위로 나눠 빠른 모델(models["correction_fast"])에 먼저 보내고,
+    로컬 검사(세그먼트 누락, 변경 비율, 키워드 누락)에 실패한 청크만 상위 모델(models["correction_strong"])로 다시 보냅니다.
+    반환값은 correct_text_with_llm과 같은 "화자: 텍스트" 줄 형식이며, 청크가 확정될 때마다 on_line(줄 번호, 줄)을 호출합니다.
+    검사 전의 줄은 내보내지 않으므로 stream은 첫 요청의 첫 토큰 시간(correction_first_token_seconds)을 재는 데만 쓰이고,
+    첫 청크가 확정되기까지의 시간은 correction_first_chunk_seconds에 기록합니다.
+    상위 청크 비율과 모델별 실측 처리 시간을 metrics에 기록합니다.
+    모든 청크를 상위 모델로 보냈을 때 대비 절약한 시간은 실측값이 아니므로 correction_latency_saved_seconds_estimated에 기록합니다.
+    상위 모델로 보낸 청크가 있으면 그 글자당 시간으로, 없으면 strong_seconds_per_1k_chars(설정값, 1000자당 초)로 추정하며,
+    상위 모델로 간 청크는 검사에 실패한 어려운 청크이고 요청마다 프롬프트 부담이 있으므로 추정값은 참고용입니다.
+    """
+    logging.info("LLM으로 텍스트 교정을 시작합니다... (모델 라우팅)")
+    correction_start_time = time.time()
+    corrected_texts = list(texts)
+    chunks = [list(range(start, min(start + chunk_lines, len(texts)))) for start in range(0, len(texts), chunk_lines)]
+    fast_seconds, strong_seconds = [], []
+    escalated_chars, accepted_chars = 0, 0
+
+    def run_chunk(model, chunk_ids, metric_key=None):
+        chunk_text = "\n".join(f"[{i}] {speakers[i]}: {texts[i]}" for i in chunk_ids)
+        request_start_time = time.time()
+        try:
+            content = _create_completion(
+                client,
+                model,
+                [
+                    {"role": "system", "content": "You are a helpful assistant that corrects and refines meeting transcripts."},
+                    {"role": "user", "content": _correction_prompt(chunk_text, topic, keywords, numbered=True)}
+                ],
+                temperature=0.5,
+                stream=stream,
+                metrics=metrics,
+                metric_key=metric_key,
+            )
+            corrected = _parse_numbered_correction(content, set(chunk_ids), speakers)
+        except Exception as e:
+            logging.error(f"LLM 교정 중 오류 발생 ({model}): {e}")
+            corrected = {}
+        return corrected, time.time() - request_start_time
+
+    for chunk_number, chunk_ids in enumerate(chunks, 1):
+        chunk_chars = sum(len(texts[i]) for i in chunk_ids)
+        first_token_key = "correction_first_token_seconds" if chunk_number == 1 else None
+        corrected, elapsed = run_chunk(models["correction_fast"], chunk_ids, first_token_key)
+        fast_seconds.append(elapsed)
+        reason = _check_correction(chunk_ids, texts, corrected, keywords, max_edit_ratio)
+
+        if reason is None:
+            accepted_chars += chunk_chars
+        else:
+            logging.info(f"교정 청크 {chunk_number}/{len(chunks)}을(를) {models['correction_strong']}로 다시 보냅니다. ({reason})")
+            strong_corrected, elapsed = run_chunk(models["correction_strong"], chunk_ids)
+            strong_seconds.append(elapsed)
+            escalated_chars += chunk_chars
+            # 상위 모델 결과가 검사를 통과하지 못해도, 누락되지 않은 줄만은 사용합니다.
+            corrected = {**corrected, **strong_corrected}
+
+        for i in chunk_ids:
+            if i in corrected:
+                corrected_texts[i] = corrected[i]
+            if on_line:
+                on_line(i, f"{speakers[i]}: {corrected_texts[i]}")
+        if metrics is not None and chunk_number == 1:
+            metrics["correction_first_chunk_seconds"] = time.time() - correction_start_time
+
+    if metrics is not None and chunks:
+        metrics["correction_chunks"] = len(chunks)
+        metrics["correction_escalated_chunks"] = len(strong_seconds)
+        metrics["correction_escalation_rate"] = len(strong_seconds) / len(chunks)
+        metrics["correction_fast_seconds"] = sum(fast_seconds)
+        metrics["correction_strong_seconds"] = sum(strong_seconds)
+        # 모든 청크를 상위 모델로 보냈을 때의 시간을 상위 모델의 글자당 처리 시간으로 추정합니다.
+        strong_seconds_per_char = None
+        if escalated_chars:
+            strong_seconds_per_char = sum(strong_seconds) / escalated_chars
+            logging.info("상위 모델로 보낸 청크의 글자당 처리 시간으로 절약 시간을 추정합니다. (어려운 청크 기준이라 크게 잡힐 수 있음)")
+        elif strong_seconds_per_1k_chars is not None:
+            strong_seconds_per_char = strong_seconds_per_1k_chars / 1000
+            logging.info("상위 모델로 보낸 청크가 없어 설정된 상위 모델 처리 속도로 절약 시간을 추정합니다.")
+        if strong_seconds_per_char is not None:
+            estimated_all_strong = strong_seconds_per_char * (accepted_chars + escalated_chars)
+            metrics["correction_latency_saved_seconds_estimated"] = estimated_all_strong - (sum(fast_seconds) + sum(strong_seconds))
+        else:
+            logging.info("상위 모델로 보낸 청크가 없고 상위 모델 처리 속도 설정도 없어 절약 시간을 추정할 수 없습니다.")
+    logging.info(f"LLM 텍스트 교정 완료. (청크 {len(chunks)}개 중 {len(strong_seconds)}개 상위 모델 사용)")
+    return "\n".join(f"{speaker}: {text}" for speaker, text in zip(speakers, corrected_texts))
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+import logging
+
+from test05.config import (RESULTS_DB_FILENAME, SPEAKER_INDEX_FILENAME, SPEAKER_MATCH_THRESHOLD,
+                           SPEAKER_AUTO_ENROLL_THRESHOLD, SPEAKER_MAX_EMBEDDINGS_PER_PERSON,
+                           AUDIO_SAMPLE_RATE, DECODE_CHUNK_SECONDS, LLM_STREAMING, LLM_MODELS,
+                           CORRECTION_ROUTING, CORRECTION_CHUNK_LINES, CORRECTION_MAX_EDIT_RATIO,
+                           CORRECTION_STRONG_SECONDS_PER_1K_CHARS,
+                           DIARIZATION_PROFILE, DIARIZATION_PROFILES)
+from test05.audio_input import decode_audio
+from test05.diarization import diarize_audio
+from test05.speaker_index import identify_speakers, save_run_embeddings
+from test05.transcription import transcribe_segment
+from test05.llm_processing import correct_text_with_llm, correct_text_routed, summarize_text
+from test05.save_results import save_results, open_summary_stream
+from test05.results_store import open_results_store, store_meeting
+from test05.transcript_model import Transcript
+
+
+def _corrected_text(original_text, corrected_line):
+    """
+    교정된 한 줄("화자: 텍스트")에서 텍스트를 꺼냅니다.
+    형식이 맞지 않으면 원본 텍스트를 유지합니다.
+    """
+    if corrected_line is not None:
+        parts = corrected_line.split(':', 1)
+        if len(parts) > 1:
+            return parts[1].strip()
+    return original_text
+
+
+def process_meeting(client, diarization_pipeline, audio_path, meeting_topic, keywords, results_dir,
+                    temp_segment_path, on_segment=None, on_corrected_segment=None, metrics=None,
+                    stream=LLM_STREAMING, meeting_name=None, diarization_profile=DIARIZATION_PROFILE):
+    """
+    한 회의 오디오를 디코딩, 화자 분리, 음성 인식, 교정, 요약, 저장까지 처리합니다.
+    on_segment는 음성 인식된 세그먼트마다, on_corrected_segment(번호, 세그먼트)는 교정된 세그먼트마다 호출되며,
+    metrics에는 단계별 처리 시간과 LLM 첫 출력까지의 시간이 기록됩니다.
+    stream이 True이면 교정/요약 응답을 스트리밍으로 받아 도착하는 대로 출력합니다.
+    결과 파일과 결과 저장소의 회의 이름은 meeting_name을 따르며, 없으면 오디오 파일명에서 만듭니다.
+    여러 작업이 같은 파일명을 쓸 수 있는 서비스 모드에서는 작업마다 고유한 이름을 넘겨야 합니다.
+    결과 저장소와 화자 색인도 results_dir 아래의 파일을 사용합니다.
+    diarization_profile은 config.DIARIZATION_PROFILES의 프로필 이름으로, 작업마다 속도/정확도를 고를 때 씁니다.
+    실패하면 None, 성공하면 전사본(Transcript)과 요약을 담은 dict를 반환합니다.
+    """
+    if metrics is None:
+        metrics = {}
+    run_start_time = time.time()
+
+    # 1. 오디오 디코딩 (m4a/mp3/webm 등을 16kHz 모노로 한 번만 디코딩)
+    stage_start_time = time.time()
+    audio = decode_audio(audio_path, AUDIO_SAMPLE_RATE, DECODE_CHUNK_SECONDS)
+    if audio is None:
+        return None
+    metrics["audio_seconds"] = audio.duration
+    metrics["decode_seconds"] = time.time() - stage_start_time
+
+    # 2. 화자 분리 (diarization_profile 프로필 적용)
+    stage_start_time = time.time()
+    diarization, speaker_embeddings = diarize_audio(
+        audio.as_pyannote_input(), None, return_embeddings=True, pipeline=diarization_pipeline,
+        profile=DIARIZATION_PROFILES[diarization_profile]
+    )
+    if not diarization:
+        return None
+    metrics["diarization_seconds"] = time.time() - stage_start_time
+    metrics["diarization_real_time_factor"] = metrics["diarization_seconds"] / audio.duration if audio.duration else 0.0
+
+    # 2-1. 등록된 화자 식별 (익명 라벨을 실제 이름으로 변경)
+    base_filename = meeting_name or os.path.splitext(os.path.basename(audio_path))[0]
+    save_run_embeddings(os.path.join(results_dir, f"speakers_{base_filename}.npz"), diarization.labels(), speaker_embeddings)
+    diarization = identify_speakers(
+        diarization, speaker_embeddings, os.path.join(results_dir, SPEAKER_INDEX_FILENAME), SPEAKER_MATCH_THRESHOLD,
+        SPEAKER_AUTO_ENROLL_THRESHOLD, SPEAKER_MAX_EMBEDDINGS_PER_PERSON
+    )
+
+    # 3. 화자 세그먼트별 음성 인식
+    diarization_result = []
+    logging.info("각 화자 세그먼트의 음성 인식을 시작합니다...")
+    stt_start_time = time.time()
+
+    # STT 프롬프트 생성
+    stt_prompt = f"이 대화는 '{meeting_topic}'에 관한 것입니다. 주요 용어는 다음과 같습니다: {', '.join(keywords)}."
+
+    for turn, _, speaker in diarization.itertracks(yield_label=True):
+        segment_audio = audio.segment(turn.start, turn.end)
+
+        text = transcribe_segment(client, segment_audio, temp_segment_path, stt_prompt)
+
+        if text:
+            segment = {
+                "start": turn.start,
+                "end": turn.end,
+                "speaker": speaker,
+                "text": text
+            }
+            diarization_result.append(segment)
+            if on_segment:
+                on_segment(segment)
+
+    stt_end_time = time.time()
+    metrics["stt_seconds"] = stt_end_time - stt_start_time
+    logging.info(f"음성 인식 완료. (총 처리 시간: {stt_end_time - stt_start_time:.2f}초)")
+
+    if not diarization_result:
+        logging.warning("음성 인식 결과가 없습니다.")
+        metrics["total_seconds"] = time.time() - run_start_time
+        return {"transcript": Transcript.from_segments([]), "summary": None}
+
+    # 세그먼트 dict 목록을 열 단위 전사본으로 변환 (원본과 교정본이 시간/화자 열을 공유)
+    transcript = Transcript.from_segments(diarization_result)
+    del diarization_result
+
+    # 4. LLM을 이용한 전체 텍스트 교정
+    stage_start_time = time.time()
+    speaker_names = transcript.speaker_names()
+
+    def on_corrected_line(i, line):
+        if on_corrected_segment and i < len(transcript):
+            on_corrected_segment(i, {
+                "start": float(transcript.starts[i]),
+                "end": float(transcript.ends[i]),
+                "speaker": speaker_names[i],
+                "text": _corrected_text(transcript.texts[i], line)
+            })
+
+    if CORRECTION_ROUTING:
+        # 빠른 모델로 먼저 교정하고, 로컬 검사에 실패한 청크만 상위 모델로 보냅니다.
+        corrected_full_transcript = correct_text_routed(
+            client, speaker_names, transcript.texts, meeting_topic, keywords,
+            LLM_MODELS, CORRECTION_CHUNK_LINES, CORRECTION_MAX_EDIT_RATIO,
+            on_line=on_corrected_line, metrics=metrics,
+            strong_seconds_per_1k_chars=CORRECTION_STRONG_SECONDS_PER_1K_CHARS, stream=stream
+        )
+    else:
+        full_transcript = "\n".join(f"{speaker}: {text}" for speaker, text in zip(speaker_names, transcript.texts))
+        corrected_full_transcript = correct_text_with_llm(
+            client, full_transcript, meeting_topic, keywords,
+            stream=stream, on_line=on_corrected_line, metrics=metrics, model=LLM_MODELS["correction_strong"]
+        )
+
+    # 교정된 전체 텍스트를 다시 화자별로 분리 (스트리밍 여부와 관계없이 최종 결과는 같은 방식으로 만듭니다)
+    corrected_lines = corrected_full_transcript.strip().split('\n')
+    transcript.corrected_texts = [
+        _corrected_text(text, corrected_lines[i] if i < len(corrected_lines) else None)
+        for i, text in enumerate(transcript.texts)
+    ]
+    metrics["correction_seconds"] = time.time() - stage_start_time
+
+    # 5. 전체 대화 내용 요약
+    stage_start_time = time.time()
+    full_corrected_transcript_for_summary = "\n".join(transcript.corrected_texts)
+    summary_stream = open_summary_stream(results_dir, audio_path, meeting_topic, base_filename) if stream else None
+
+    def on_summary_token(token):
+        summary_stream.write(token)
+        summary_stream.flush()
+
+    try:
+        summary = summarize_text(
+            client, full_corrected_transcript_for_summary, meeting_topic, keywords,
+            stream=stream, on_token=on_summary_token if summary_stream else None, metrics=metrics,
+            model=LLM_MODELS["summary"]
+        )
+    finally:
+        if summary_stream:
+            summary_stream.close()
+    metrics["summary_seconds"] = time.time() - stage_start_time
+
+    # 6. 결과 저장 (스트리밍 중 쓰던 요약 파일도 비스트리밍 경로와 같은 최종본으로 다시 씁니다)
+    save_results(
+        transcript,
+        summary,
+        audio_path,
+        results_dir,
+        meeting_topic,
+        keywords,
+        base_filename
+    )
+
+    # 7. 결과 저장소에 색인 (전체 회의 검색용)
+    conn = open_results_store(os.path.join(results_dir, RESULTS_DB_FILENAME))
+    try:
+        store_meeting(
+            conn,
+            base_filename,
+            transcript,
+            summary,
+            audio_path,
+            meeting_topic,
+            keywords
+        )
+    finally:
+        conn.close()
+
+    metrics["total_seconds"] = time.time() - run_start_time
+    logging.info("처리 지표: " + ", ".join(f"{key}={value:.2f}" for key, value in metrics.items()))
+    return {"transcript": transcript, "summary": summary}
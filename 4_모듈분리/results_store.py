@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import sys
+import sqlite3
+import logging
+import argparse
+import numpy as np
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    audio_path TEXT,
+    topic TEXT,
+    keywords TEXT,
+    summary TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS speakers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    start_ms INTEGER NOT NULL,
+    end_ms INTEGER NOT NULL,
+    speaker_id INTEGER NOT NULL REFERENCES speakers(id),
+    text TEXT NOT NULL,
+    corrected_text TEXT NOT NULL,
+    text_bigrams TEXT NOT NULL DEFAULT '',
+    corrected_bigrams TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_segments_meeting ON segments(meeting_id, seq);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+    text, corrected_text,
+    content='segments', content_rowid='id',
+    tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS segments_ai AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts(rowid, text, corrected_text)
+    VALUES (new.id, new.text, new.corrected_text);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_ad AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts(segments_fts, rowid, text, corrected_text)
+    VALUES ('delete', old.id, old.text, old.corrected_text);
+END;
+"""
+
+# 두 글자 검색어용 색인. 세그먼트마다 공백으로 구분한 2-gram을 저장해 두고 unicode61 토크나이저로 색인합니다.
+_BIGRAM_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_bigram_fts USING fts5(
+    text_bigrams, corrected_bigrams,
+    content='segments', content_rowid='id',
+    tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS segments_bigram_ai AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_bigram_fts(rowid, text_bigrams, corrected_bigrams)
+    VALUES (new.id, new.text_bigrams, new.corrected_bigrams);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_bigram_ad AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_bigram_fts(segments_bigram_fts, rowid, text_bigrams, corrected_bigrams)
+    VALUES ('delete', old.id, old.text_bigrams, old.corrected_bigrams);
+END;
+"""
+
+# trigram 토크나이저는 3글자 미만의 검색어를 찾을 수 없으므로, 두 글자 검색어는 2-gram 색인으로 찾고
+# 한 글자 검색어만 LIKE 검색으로 대체합니다.
+_MIN_FTS_QUERY_LENGTH = 3
+_BIGRAM_QUERY_LENGTH = 2
+_WORD = re.compile(r"\w+")
+
+
+def _bigrams(text):
+    """
+    텍스트의 단어 문자 구간마다 2-gram을 만들어 공백으로 이어 붙입니다.
+    """
+    return " ".join(word[i:i + 2] for word in _WORD.findall(text) for i in range(len(word) - 1))
+
+
+def _migrate_bigram_columns(conn):
+    """
+    2-gram 열이 없는 이전 저장소에 열을 추가하고, 기존 세그먼트의 2-gram 색인을 채웁니다.
+    """
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(segments)")}
+    if "text_bigrams" in columns:
+        return
+    logging.info("결과 저장소에 두 글자 검색용 2-gram 색인을 추가합니다...")
+    with conn:
+        conn.execute("ALTER TABLE segments ADD COLUMN text_bigrams TEXT NOT NULL DEFAULT ''")
+        conn.execute("ALTER TABLE segments ADD COLUMN corrected_bigrams TEXT NOT NULL DEFAULT ''")
+        rows = conn.execute("SELECT id, text, corrected_text FROM segments").fetchall()
+        conn.executemany(
+            "UPDATE segments SET text_bigrams = ?, corrected_bigrams = ? WHERE id = ?",
+            [(_bigrams(row["text"]), _bigrams(row["corrected_text"]), row["id"]) for row in rows],
+        )
+
+
+def open_results_store(db_path):
+    """
+    결과 저장소(SQLite)를 열고 스키마를 준비합니다.
+    한국어 검색을 위해 FTS5 trigram(3-gram) 토크나이저로 전문 색인을 만들고,
+    trigram으로 찾을 수 없는 두 글자 검색어(예: "소통")를 위해 2-gram 색인을 함께 만듭니다.
+    """
+    db_dir = os.path.dirname(db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(_SCHEMA)
+    _migrate_bigram_columns(conn)
+    # 2-gram 색인을 처음 만들 때는 이미 저장된 세그먼트로 색인을 채웁니다.
+    bigram_index_exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'segments_bigram_fts'"
+    ).fetchone()
+    conn.executescript(_BIGRAM_SCHEMA)
+    if not bigram_index_exists:
+        with conn:
+            conn.execute("INSERT INTO segments_bigram_fts(segments_bigram_fts) VALUES ('rebuild')")
+    return conn
+
+
+def _speaker_ids(conn, speakers):
+    """
+    화자 이름 목록을 speakers 테이블의 ID로 변환합니다. 없는 화자는 새로 등록합니다.
+    """
+    conn.executemany("INSERT OR IGNORE INTO speakers(name) VALUES (?)", [(name,) for name in speakers])
+    ids = {}
+    for name in speakers:
+        row = conn.execute("SELECT id FROM speakers WHERE name = ?", (name,)).fetchone()
+        ids[name] = row["id"]
+    return ids
+
+
+def store_meeting(conn, meeting_name, transcript, summary, audio_path, meeting_topic, keywords):
+    """
+    한 회의의 세그먼트, 화자, 타임스탬프, 요약을 한 트랜잭션으로 일괄 저장합니다.
+    transcript는 Transcript이며, 같은 이름의 회의가 이미 있으면 교체합니다.
+    """
+    try:
+        with conn:
+            conn.execute("DELETE FROM meetings WHERE name = ?", (meeting_name,))
+            cursor = conn.execute(
+                "INSERT INTO meetings(name, audio_path, topic, keywords, summary) VALUES (?, ?, ?, ?, ?)",
+                (meeting_name, audio_path, meeting_topic, ", ".join(keywords), summary),
+            )
+            meeting_id = cursor.lastrowid
+            speaker_ids = _speaker_ids(conn, transcript.speakers)
+            # 전사본의 화자 ID를 저장소의 화자 ID로 한 번에 변환합니다.
+            store_speaker_ids = np.array([speaker_ids[name] for name in transcript.speakers], dtype=np.int64)
+
+            corrected_texts = transcript.corrected_texts if transcript.corrected_texts is not None else transcript.texts
+            rows = list(zip(
+                [meeting_id] * len(transcript),
+                range(len(transcript)),
+                np.rint(transcript.starts * 1000).astype(np.int64).tolist(),
+                np.rint(transcript.ends * 1000).astype(np.int64).tolist(),
+                store_speaker_ids[transcript.speaker_ids].tolist(),
+                transcript.texts,
+                corrected_texts,
+                [_bigrams(text) for text in transcript.texts],
+                [_bigrams(text) for text in corrected_texts],
+            ))
+            conn.executemany(
+                "INSERT INTO segments(meeting_id, seq, start_ms, end_ms, speaker_id, text, corrected_text, "
+                "text_bigrams, corrected_bigrams) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        logging.info(f"결과 저장소에 회의 '{meeting_name}'의 세그먼트 {len(rows)}개를 저장했습니다.")
+        return meeting_id
+    except sqlite3.Error as e:
+        logging.error(f"결과 저장소 저장 중 오류 발생 ({meeting_name}): {e}")
+        return None
+
+
+def search_segments(conn, query, speaker=None, meeting=None, limit=100):
+    """
+    모든 회의에서 검색어가 포함된 세그먼트를 찾습니다.
+    결과에는 회의 이름, 화자, 밀리초 단위 타임스탬프, 원본/교정 텍스트가 포함됩니다.
+    """
+    query = query.strip()
+    if not query:
+        return []
+
+    select = (
+        "SELECT m.name AS meeting, sp.name AS speaker, s.start_ms, s.end_ms, s.text, s.corrected_text "
+        "FROM segments s "
+        "JOIN meetings m ON m.id = s.meeting_id "
+        "JOIN speakers sp ON sp.id = s.speaker_id "
+    )
+    conditions = []
+    params = []
+    if len(query) >= _MIN_FTS_QUERY_LENGTH:
+        select += "JOIN segments_fts f ON f.rowid = s.id "
+        conditions.append("segments_fts MATCH ?")
+        # 검색어 전체를 하나의 구문으로 취급하도록 따옴표로 감쌉니다.
+        params.append('"' + query.replace('"', '""') + '"')
+    elif len(query) == _BIGRAM_QUERY_LENGTH and _WORD.fullmatch(query):
+        select += "JOIN segments_bigram_fts b ON b.rowid = s.id "
+        conditions.append("segments_bigram_fts MATCH ?")
+        params.append(f'"{query}"')
+    else:
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        conditions.append("(s.text LIKE ? ESCAPE '\\' OR s.corrected_text LIKE ? ESCAPE '\\')")
+        params.extend([pattern, pattern])
+    if speaker:
+        conditions.append("sp.name = ?")
+        params.append(speaker)
+    if meeting:
+        conditions.append("m.name = ?")
+        params.append(meeting)
+
+    sql = select + "WHERE " + " AND ".join(conditions) + " ORDER BY m.name, s.start_ms LIMIT ?"
+    params.append(limit)
+    try:
+        return [dict(row) for row in conn.execute(sql, params)]
+    except sqlite3.Error as e:
+        logging.error(f"결과 저장소 검색 중 오류 발생 ({query}): {e}")
+        return []
+
+
+def main(argv=None):
+    """
+    결과 저장소 검색 CLI.
+    예) python -m test05.results_store 워크숍 --speaker SPEAKER_01
+    """
+    from test05.config import RESULTS_DB_PATH
+
+    parser = argparse.ArgumentParser(description="저장된 모든 회의에서 발언을 검색합니다.")
+    parser.add_argument("query", help="검색어")
+    parser.add_argument("--db", default=RESULTS_DB_PATH, help="결과 저장소 경로")
+    parser.add_argument("--speaker", help="화자 이름으로 필터링")
+    parser.add_argument("--meeting", help="회의 이름으로 필터링")
+    parser.add_argument("--limit", type=int, default=100, help="최대 결과 수")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        logging.error(f"결과 저장소를 찾을 수 없습니다: {args.db}")
+        return 1
+
+    conn = open_results_store(args.db)
+    try:
+        for row in search_segments(conn, args.query, args.speaker, args.meeting, args.limit):
+            print(f"{row['meeting']} [{row['start_ms']}ms - {row['end_ms']}ms] {row['speaker']}: {row['corrected_text']}")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -3,18 +3,50 @@ import os
 import json
 import logging
 
-def save_results(diarization_result, corrected_diarization, summary, original_filename, results_dir, meeting_topic, keywords):
+from test05.transcript_model import Transcript
+
+def _base_filename(original_filename, base_filename=None):
+    if base_filename:
+        return base_filename
+    return os.path.splitext(os.path.basename(original_filename))[0]
+
+def _summary_filename(results_dir, base_filename):
+    return os.path.join(results_dir, f"summary_{base_filename}.md")
+
+def _write_summary_header(f, meeting_topic):
+    f.write(f"# 회의 요약: {meeting_topic}\n\n")
+    f.write("## 주요 내용\n")
+
+def open_summary_stream(results_dir, original_filename, meeting_topic, base_filename=None):
+    """
+    요약 토큰을 도착하는 대로 summary_*.md에 이어 쓰기 위한 파일을 엽니다.
+    헤더를 먼저 쓴 파일 객체를 반환하며, 최종 파일은 save_results가 다시 씁니다.
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    summary_filename = _summary_filename(results_dir, _base_filename(original_filename, base_filename))
+    try:
+        f = open(summary_filename, "w", encoding="utf-8")
+        _write_summary_header(f, meeting_topic)
+        f.flush()
+        return f
+    except IOError as e:
+        logging.error(f"파일 저장 중 오류 발생 ({summary_filename}): {e}")
+        return None
+
+def save_results(transcript, summary, original_filename, results_dir, meeting_topic, keywords, base_filename=None):
     """
     변환된 텍스트와 요약, 교정된 내용을 파일로 저장합니다.
+    transcript는 원본/교정 텍스트를 함께 담은 Transcript입니다.
+    결과 파일명은 base_filename을 따르며, 없으면 오디오 파일명에서 만듭니다.
     """
     os.makedirs(results_dir, exist_ok=True)
-    base_filename = os.path.splitext(os.path.basename(original_filename))[0]
+    base_filename = _base_filename(original_filename, base_filename)
 
     # 1. 원본 STT 결과 (TXT)
     txt_filename = os.path.join(results_dir, f"stt_{base_filename}.txt")
     try:
         with open(txt_filename, "w", encoding="utf-8") as f:
-            for segment in diarization_result:
+            for segment in transcript.original_segments():
                 f.write(f"[{segment['start']:.2f}s - {segment['end']:.2f}s] {segment['speaker']}: {segment['text']}\n")
         logging.info(f"STT 결과를 '{txt_filename}'에 저장했습니다.")
     except IOError as e:
@@ -24,21 +56,20 @@ def save_results(diarization_result, corrected_diarization, summary, original_fi
     corrected_txt_filename = os.path.join(results_dir, f"corrected_{base_filename}.txt")
     try:
         with open(corrected_txt_filename, "w", encoding="utf-8") as f:
-            for segment in corrected_diarization:
+            for segment in transcript.corrected_segments():
                 f.write(f"[{segment['start']:.2f}s - {segment['end']:.2f}s] {segment['speaker']}: {segment['text']}\n")
         logging.info(f"LLM 교정 결과를 '{corrected_txt_filename}'에 저장했습니다.")
     except IOError as e:
         logging.error(f"파일 저장 중 오류 발생 ({corrected_txt_filename}): {e}")
 
     # 3. 회의 요약 결과 (MD)
-    summary_filename = os.path.join(results_dir, f"summary_{base_filename}.md")
+    summary_filename = _summary_filename(results_dir, base_filename)
     try:
         with open(summary_filename, "w", encoding="utf-8") as f:
-            f.write(f"# 회의 요약: {meeting_topic}\n\n")
-            f.write("## 주요 내용\n")
+            _write_summary_header(f, meeting_topic)
             f.write(summary + "\n\n")
             f.write("## 전체 대화 내용 (교정본)\n")
-            for segment in corrected_diarization:
+            for segment in transcript.corrected_segments():
                 f.write(f"- **{segment['speaker']}**: {segment['text']}\n")
         logging.info(f"회의 요약 및 전체 대화 내용을 '{summary_filename}'에 저장했습니다.")
     except IOError as e:
@@ -49,8 +80,8 @@ def save_results(diarization_result, corrected_diarization, summary, original_fi
     combined_results = {
         "meeting_topic": meeting_topic,
         "keywords": keywords,
-        "original_transcript": diarization_result,
-        "corrected_transcript": corrected_diarization,
+        "original_transcript": list(transcript.original_segments()),
+        "corrected_transcript": list(transcript.corrected_segments()),
         "summary": summary
     }
     try:
@@ -59,3 +90,15 @@ def save_results(diarization_result, corrected_diarization, summary, original_fi
         logging.info(f"모든 결과를 '{json_filename}'에 저장했습니다.")
     except IOError as e:
         logging.error(f"파일 저장 중 오류 발생 ({json_filename}): {e}")
+
+    # 5. 바이너리 전사본 (대량 재처리 시 빠르게 불러오기 위한 형식, load_transcript로 읽음)
+    binary_filename = os.path.join(results_dir, f"transcript_{base_filename}.bin")
+    metadata = {"meeting_topic": meeting_topic, "keywords": keywords, "summary": summary}
+    if transcript.save_binary(binary_filename, metadata):
+        logging.info(f"바이너리 전사본을 '{binary_filename}'에 저장했습니다.")
+
+def load_transcript(binary_filename):
+    """
+    save_results가 저장한 바이너리 전사본을 읽어 (Transcript, 메타데이터)를 반환합니다.
+    """
+    return Transcript.load_binary(binary_filename)
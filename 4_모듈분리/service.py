@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import shutil
+import logging
+import tempfile
+import threading
+from collections import deque
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from test05.config import (MEETING_TOPIC, KEYWORDS, RESULTS_DIR, SERVICE_HOST, SERVICE_PORT,
+                           SERVICE_WORKERS, SERVICE_QUEUE_SIZE, UPLOAD_DIR, SERVICE_JOB_TTL_SECONDS,
+                           SERVICE_MAX_FINISHED_JOBS, SERVICE_KEEP_UPLOADS, DIARIZATION_PROFILE,
+                           DIARIZATION_PROFILES, DIARIZATION_NUM_THREADS)
+from test05.meeting_pipeline import process_meeting
+
+# 지연 시간 통계에 사용할 최근 완료 작업 수
+_LATENCY_WINDOW = 1000
+_UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+class MeetingService:
+    """
+    모델과 API 클라이언트를 한 번만 불러 둔 채로 회의 처리 작업을 큐에서 처리합니다.
+    client와 diarization_pipeline을 주입받으므로 테스트에서는 가짜 백엔드를 넘길 수 있습니다.
+    완료된 작업은 job_ttl초가 지나거나 max_finished_jobs개를 넘으면 오래된 것부터 지웁니다.
+    """
+
+    def __init__(self, client, diarization_pipeline, results_dir=RESULTS_DIR,
+                 workers=SERVICE_WORKERS, queue_size=SERVICE_QUEUE_SIZE, process=process_meeting,
+                 job_ttl=SERVICE_JOB_TTL_SECONDS, max_finished_jobs=SERVICE_MAX_FINISHED_JOBS,
+                 keep_uploads=SERVICE_KEEP_UPLOADS):
+        self.client = client
+        self.diarization_pipeline = diarization_pipeline
+        self.results_dir = results_dir
+        self.process = process
+        self.job_ttl = job_ttl
+        self.max_finished_jobs = max_finished_jobs
+        self.keep_uploads = keep_uploads
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.queue_waits = deque(maxlen=_LATENCY_WINDOW)
+        self.run_times = deque(maxlen=_LATENCY_WINDOW)
+        self.temp_dir = tempfile.mkdtemp(prefix="minute_segments_")
+        self.workers = [
+            threading.Thread(target=self._worker, name=f"meeting-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, audio_path, meeting_topic, keywords, job_id=None, upload_dir=None,
+               diarization_profile=DIARIZATION_PROFILE):
+        """
+        작업을 큐에 넣습니다. 큐가 가득 차면 None을 반환합니다.
+        upload_dir는 업로드된 오디오를 담은 작업별 디렉터리로, 작업이 끝나면 지웁니다.
+        diarization_profile은 이 작업에 적용할 화자 분리 프로필 이름입니다.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "audio_path": audio_path,
+            "meeting_topic": meeting_topic,
+            "keywords": keywords,
+            "diarization_profile": diarization_profile,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "segments": [],
+            "corrected_segments": {},
+            "result": None,
+            "metrics": {},
+            "error": None,
+            "upload_dir": upload_dir,
+        }
+        with self.lock:
+            self._evict_finished_jobs()
+            self.jobs[job_id] = job
+        try:
+            self.queue.put_nowait(job_id)
+        except queue.Full:
+            with self.lock:
+                del self.jobs[job_id]
+            logging.warning(f"작업 큐가 가득 찼습니다. (최대 {self.queue.maxsize}개)")
+            return None
+        logging.info(f"작업 {job_id}을(를) 큐에 추가했습니다: {audio_path}")
+        return job_id
+
+    def _worker(self):
+        while True:
+            job_id = self.queue.get()
+            if job_id is None:
+                self.queue.task_done()
+                return
+            try:
+                self._run(job_id)
+            finally:
+                self.queue.task_done()
+
+    def _run(self, job_id):
+        with self.lock:
+            job = self.jobs[job_id]
+            job["status"] = "running"
+            job["started_at"] = time.time()
+
+        def on_segment(segment):
+            with self.lock:
+                job["segments"].append(segment)
+
+        def on_corrected_segment(i, segment):
+            with self.lock:
+                job["corrected_segments"][i] = segment
+
+        temp_segment_path = os.path.join(self.temp_dir, f"segment_{job_id}.wav")
+        # 같은 파일명의 작업끼리 결과 파일과 결과 저장소 항목을 덮어쓰지 않도록 작업 ID를 붙입니다.
+        meeting_name = f"{os.path.splitext(os.path.basename(job['audio_path']))[0]}_{job_id}"
+        try:
+            result = self.process(
+                self.client,
+                self.diarization_pipeline,
+                job["audio_path"],
+                job["meeting_topic"],
+                job["keywords"],
+                self.results_dir,
+                temp_segment_path,
+                on_segment=on_segment,
+                on_corrected_segment=on_corrected_segment,
+                metrics=job["metrics"],
+                meeting_name=meeting_name,
+                diarization_profile=job["diarization_profile"],
+            )
+            error = None if result is not None else "회의 처리에 실패했습니다. 서버 로그를 확인해주세요."
+            if result is not None and "transcript" in result:
+                # 응답은 JSON이므로 전사본을 기존 dict 세그먼트 형식으로 바꿉니다.
+                transcript = result["transcript"]
+                result = {
+                    "original_transcript": list(transcript.original_segments()),
+                    "corrected_transcript": list(transcript.corrected_segments()),
+                    "summary": result["summary"],
+                }
+        except Exception as e:
+            logging.error(f"작업 {job_id} 처리 중 오류 발생: {e}")
+            result, error = None, str(e)
+
+        with self.lock:
+            # 스트리밍 도중 교정이 실패하면 최종 결과는 원본 텍스트로 돌아가므로,
+            # 중간에 받은 교정 세그먼트 대신 최종 결과로 다시 채웁니다.
+            job["corrected_segments"] = dict(enumerate(result.get("corrected_transcript", []))) if result else {}
+            job["finished_at"] = time.time()
+            job["result"] = result
+            job["error"] = error
+            job["status"] = "failed" if error else "done"
+            self.queue_waits.append(job["started_at"] - job["submitted_at"])
+            self.run_times.append(job["finished_at"] - job["started_at"])
+            self._evict_finished_jobs()
+        if job["upload_dir"] and not self.keep_uploads:
+            shutil.rmtree(job["upload_dir"], ignore_errors=True)
+        logging.info(f"작업 {job_id} 종료: {job['status']}")
+
+    def _evict_finished_jobs(self):
+        """
+        보관 시간이 지났거나 최대 개수를 넘은 완료 작업을 지웁니다. self.lock을 잡은 상태에서 호출합니다.
+        """
+        finished = sorted(
+            (job for job in self.jobs.values() if job["finished_at"] is not None),
+            key=lambda job: job["finished_at"],
+        )
+        expire_before = time.time() - self.job_ttl
+        overflow = len(finished) - self.max_finished_jobs
+        for i, job in enumerate(finished):
+            if i < overflow or job["finished_at"] < expire_before:
+                del self.jobs[job["id"]]
+
+    def job_status(self, job_id):
+        """
+        작업 상태를 반환합니다. 완료된 작업에는 결과가 포함됩니다.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            status = {key: value for key, value in job.items()
+                      if key not in ("segments", "corrected_segments", "upload_dir")}
+            status["metrics"] = dict(job["metrics"])
+            status["segment_count"] = len(job["segments"])
+            return status
+
+    def job_transcript(self, job_id):
+        """
+        지금까지 음성 인식된(부분) 세그먼트와 교정된 세그먼트 목록을 반환합니다.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            corrected = job["corrected_segments"]
+            return {
+                "id": job_id,
+                "status": job["status"],
+                "segments": list(job["segments"]),
+                "corrected_segments": [corrected[i] for i in sorted(corrected)],
+            }
+
+    def metrics(self):
+        """
+        큐 깊이, 상태별 작업 수, 대기/처리 지연 시간 통계를 반환합니다.
+        """
+        with self.lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return {
+                "queue_depth": self.queue.qsize(),
+                "queue_capacity": self.queue.maxsize,
+                "jobs": counts,
+                "queue_wait_seconds": _latency_stats(self.queue_waits),
+                "run_seconds": _latency_stats(self.run_times),
+            }
+
+    def stop(self):
+        """
+        진행 중인 작업이 끝나면 워커를 종료합니다.
+        """
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+def _latency_stats(values):
+    if not values:
+        return {"count": 0, "mean": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+class MeetingRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /jobs                 작업 등록 (JSON {"audio_path", "topic", "keywords", "profile"} 또는 오디오 업로드)
+    GET  /jobs/<id>            작업 상태 및 결과
+    GET  /jobs/<id>/transcript 부분 음성 인식 결과
+    GET  /metrics              큐 깊이와 지연 시간
+    """
+
+    service = None
+    upload_dir = UPLOAD_DIR
+
+    def _send_json(self, status_code, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        if parts == ["metrics"]:
+            self._send_json(200, self.service.metrics())
+        elif len(parts) == 2 and parts[0] == "jobs":
+            status = self.service.job_status(parts[1])
+            if status is None:
+                self._send_json(404, {"error": "작업을 찾을 수 없습니다."})
+            else:
+                self._send_json(200, status)
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "transcript":
+            transcript = self.service.job_transcript(parts[1])
+            if transcript is None:
+                self._send_json(404, {"error": "작업을 찾을 수 없습니다."})
+            else:
+                self._send_json(200, transcript)
+        else:
+            self._send_json(404, {"error": "알 수 없는 경로입니다."})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "알 수 없는 경로입니다."})
+            return
+
+        try:
+            content_length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            self._send_json(400, {"error": "Content-Length가 올바르지 않습니다."})
+            return
+        content_type = self.headers.get("Content-Type", "")
+        job_id = uuid.uuid4().hex
+        upload_path = None
+
+        if content_type.startswith("application/json"):
+            try:
+                body = json.loads(self.rfile.read(content_length) or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": "JSON 형식이 올바르지 않습니다."})
+                return
+            if not isinstance(body, dict):
+                self._send_json(400, {"error": "JSON 본문은 객체여야 합니다."})
+                return
+            audio_path = body.get("audio_path")
+            meeting_topic = body.get("topic", MEETING_TOPIC)
+            keywords = body.get("keywords", KEYWORDS)
+            profile = body.get("profile", DIARIZATION_PROFILE)
+            if not isinstance(meeting_topic, str):
+                self._send_json(400, {"error": "topic은 문자열이어야 합니다."})
+                return
+            if not isinstance(keywords, list) or not all(isinstance(keyword, str) for keyword in keywords):
+                self._send_json(400, {"error": "keywords는 문자열 목록이어야 합니다."})
+                return
+            if not isinstance(profile, str) or profile not in DIARIZATION_PROFILES:
+                self._send_json(400, {"error": f"profile은 {', '.join(DIARIZATION_PROFILES)} 중 하나여야 합니다."})
+                return
+            if not isinstance(audio_path, str) or not os.path.exists(audio_path):
+                self._send_json(400, {"error": f"오디오 파일을 찾을 수 없습니다: {audio_path}"})
+                return
+        else:
+            # 오디오 본문 업로드: 주제와 키워드는 쿼리 문자열로 받습니다.
+            query = parse_qs(url.query)
+            filename = os.path.basename(query.get("filename", ["upload.wav"])[0]) or "upload.wav"
+            meeting_topic = query.get("topic", [MEETING_TOPIC])[0]
+            keywords = query["keywords"][0].split(",") if "keywords" in query else KEYWORDS
+            keywords = [keyword.strip() for keyword in keywords if keyword.strip()]
+            profile = query.get("profile", [DIARIZATION_PROFILE])[0]
+            if not isinstance(profile, str) or profile not in DIARIZATION_PROFILES:
+                self._send_json(400, {"error": f"profile은 {', '.join(DIARIZATION_PROFILES)} 중 하나여야 합니다."})
+                return
+            if content_length <= 0:
+                self._send_json(400, {"error": "업로드된 오디오가 없습니다."})
+                return
+            # 업로드끼리 파일명이 같아도 겹치지 않도록 작업별 디렉터리에 저장합니다.
+            upload_path = os.path.join(self.upload_dir, job_id, filename)
+            os.makedirs(os.path.dirname(upload_path), exist_ok=True)
+            remaining = content_length
+            try:
+                with open(upload_path, "wb") as f:
+                    while remaining > 0:
+                        chunk = self.rfile.read(min(_UPLOAD_CHUNK_BYTES, remaining))
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        remaining -= len(chunk)
+            except OSError as e:
+                logging.error(f"업로드 저장 중 오류 발생 ({upload_path}): {e}")
+            if remaining > 0:
+                # 클라이언트가 업로드 도중 연결을 끊으면 잘린 파일을 처리하지 않습니다.
+                shutil.rmtree(os.path.dirname(upload_path), ignore_errors=True)
+                self._send_json(400, {"error": f"업로드가 중간에 끊겼습니다. ({content_length - remaining}/{content_length} 바이트)"})
+                return
+            audio_path = upload_path
+
+        upload_dir = os.path.dirname(upload_path) if upload_path else None
+        if self.service.submit(audio_path, meeting_topic, keywords, job_id=job_id, upload_dir=upload_dir,
+                               diarization_profile=profile) is None:
+            if upload_path:
+                shutil.rmtree(os.path.dirname(upload_path), ignore_errors=True)
+            self._send_json(503, {"error": "작업 큐가 가득 찼습니다. 잠시 후 다시 시도해주세요."})
+            return
+        self._send_json(202, {"id": job_id, "status": "queued"})
+
+    def log_message(self, format, *args):
+        logging.info("%s - %s" % (self.address_string(), format % args))
+
+
+def create_server(service, host=SERVICE_HOST, port=SERVICE_PORT, upload_dir=UPLOAD_DIR):
+    """
+    서비스에 연결된 HTTP 서버를 만듭니다. port=0이면 빈 포트를 사용합니다.
+    """
+    handler = type("BoundMeetingRequestHandler", (MeetingRequestHandler,), {
+        "service": service,
+        "upload_dir": upload_dir,
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    """
+    서비스 모드 실행 함수. 모델과 클라이언트를 한 번 불러 두고 요청을 처리합니다.
+    """
+    from openai import OpenAI
+    from test05.api_keys import load_api_keys
+    from test05.diarization import load_diarization_pipeline
+
+    openai_api_key, pyannote_token = load_api_keys()
+    if not openai_api_key or not pyannote_token:
+        sys.exit(1)
+
+    client = OpenAI(api_key=openai_api_key)
+    diarization_pipeline = load_diarization_pipeline(pyannote_token, DIARIZATION_NUM_THREADS)
+    if diarization_pipeline is None:
+        sys.exit(1)
+
+    service = MeetingService(client, diarization_pipeline)
+    server = create_server(service)
+    logging.info(f"회의록 서비스를 시작합니다: http://{SERVICE_HOST}:{SERVICE_PORT}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("서비스를 종료합니다...")
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+import time
+import wave
+import socket
+import logging
+import tempfile
+import threading
+import http.client
+from types import SimpleNamespace
+from urllib.parse import urlencode
+import numpy as np
+from pyannote.core import Annotation, Segment
+
+from test05.service import MeetingService, create_server
+
+_SAMPLE_RATE = 16000
+_AUDIO_SECONDS = 4
+_JOB_TIMEOUT_SECONDS = 60
+
+
+class FakeClient:
+    """
+    OpenAI 클라이언트 대신 사용하는 가짜 백엔드.
+    음성 인식은 고정 문장을, 교정은 원본 줄을 그대로, 요약은 고정 문장을 돌려줍니다.
+    """
+
+    def __init__(self):
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self._transcribe))
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._complete))
+
+    def _transcribe(self, model, file, prompt):
+        return SimpleNamespace(text="사내 소통 활성화 방안을 논의합니다")
+
+    def _complete(self, model, messages, temperature, stream=False):
+        prompt = messages[-1]["content"]
+        if "원본 텍스트:" in prompt:
+            source = prompt.split("원본 텍스트:", 1)[1].rsplit("교정된 텍스트:", 1)[0]
+            content = "\n".join(line.strip() for line in source.strip().split("\n"))
+        else:
+            content = "가짜 요약입니다."
+        if not stream:
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        return iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content[i:i + 8]))])
+                     for i in range(0, len(content), 8)])
+
+
+class FakeDiarizationPipeline:
+    """
+    pyannote 파이프라인 대신 오디오를 두 화자가 번갈아 말한 것으로 나누는 가짜 백엔드.
+    """
+
+    segmentation_batch_size = 32
+    embedding_batch_size = 32
+
+    def __init__(self):
+        self._params = {"clustering": {"threshold": 0.7045654963945799}}
+        self._segmentation = SimpleNamespace(duration=10.0, step=1.0)
+
+    def parameters(self, instantiated=False):
+        return {"clustering": dict(self._params["clustering"])}
+
+    def instantiate(self, params):
+        self._params = params
+
+    def __call__(self, audio, return_embeddings=False, **speaker_hints):
+        duration = audio["waveform"].shape[-1] / audio["sample_rate"]
+        diarization = Annotation()
+        diarization[Segment(0, duration / 2)] = "SPEAKER_00"
+        diarization[Segment(duration / 2, duration)] = "SPEAKER_01"
+        if return_embeddings:
+            return diarization, np.random.default_rng(0).normal(size=(2, 256)).astype(np.float32)
+        return diarization
+
+
+def _write_test_audio(path):
+    t = np.arange(_AUDIO_SECONDS * _SAMPLE_RATE) / _SAMPLE_RATE
+    samples = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(_SAMPLE_RATE)
+        f.writeframes(samples.tobytes())
+
+
+def _request(port, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read() or b"{}")
+    finally:
+        conn.close()
+
+
+def _send_truncated_upload(port):
+    """
+    Content-Length보다 짧은 본문을 보내고 연결을 끊어, 잘린 업로드가 거부되는지 확인합니다.
+    """
+    with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+        sock.sendall(b"POST /jobs?filename=cut.wav HTTP/1.1\r\nHost: localhost\r\n"
+                     b"Content-Type: audio/wav\r\nContent-Length: 1000\r\n\r\n" + b"\0" * 10)
+        sock.shutdown(socket.SHUT_WR)
+        response = sock.makefile("rb").readline()
+    return int(response.split()[1])
+
+
+def run_smoke(work_dir, workers=2):
+    """
+    가짜 백엔드로 서비스를 띄워 업로드부터 결과 저장까지 한 번 실행하고, 실패한 검사 목록을 반환합니다.
+    결과 파일, 결과 저장소, 화자 색인은 모두 work_dir 아래에만 만들어져야 합니다.
+    """
+    results_dir = os.path.join(work_dir, "results")
+    upload_dir = os.path.join(work_dir, "uploads")
+    audio_path = os.path.join(work_dir, "회의.wav")
+    _write_test_audio(audio_path)
+
+    service = MeetingService(FakeClient(), FakeDiarizationPipeline(), results_dir=results_dir, workers=workers)
+    server = create_server(service, port=0, upload_dir=upload_dir)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    failures = []
+    try:
+        with open(audio_path, "rb") as f:
+            data = f.read()
+        job_ids = []
+        for profile in ("fast", "accurate"):
+            query = urlencode({"filename": "회의.wav", "keywords": "소통", "profile": profile})
+            status, body = _request(port, "POST", "/jobs?" + query, body=data, headers={"Content-Type": "audio/wav"})
+            if status != 202:
+                failures.append(f"업로드 응답 {status}: {body}")
+                continue
+            job_ids.append(body["id"])
+
+        status, _ = _request(port, "POST", "/jobs?" + urlencode({"profile": "없는프로필"}),
+                             body=data, headers={"Content-Type": "audio/wav"})
+        if status != 400:
+            failures.append(f"알 수 없는 프로필 요청 응답 {status}")
+        if _send_truncated_upload(port) != 400:
+            failures.append("잘린 업로드가 거부되지 않았습니다.")
+
+        deadline = time.time() + _JOB_TIMEOUT_SECONDS
+        for job_id in job_ids:
+            while True:
+                status, body = _request(port, "GET", f"/jobs/{job_id}")
+                if body.get("status") in ("done", "failed") or time.time() > deadline:
+                    break
+                time.sleep(0.2)
+            if body.get("status") != "done":
+                failures.append(f"작업 {job_id} 상태: {body.get('status')} ({body.get('error')})")
+                continue
+            _, transcript = _request(port, "GET", f"/jobs/{job_id}/transcript")
+            if transcript["corrected_segments"] != body["result"]["corrected_transcript"]:
+                failures.append(f"작업 {job_id}의 교정 세그먼트가 최종 결과와 다릅니다.")
+            if not os.path.exists(os.path.join(results_dir, f"stt_회의_{job_id}.txt")):
+                failures.append(f"작업 {job_id}의 결과 파일이 없습니다.")
+
+        if not os.path.exists(os.path.join(results_dir, "results.db")):
+            failures.append("결과 저장소가 results_dir 아래에 만들어지지 않았습니다.")
+        if os.path.isdir(upload_dir) and os.listdir(upload_dir):
+            failures.append(f"업로드가 지워지지 않았습니다: {os.listdir(upload_dir)}")
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+    return failures
+
+
+def main():
+    """
+    가짜 백엔드로 서비스 모드를 점검하는 스모크 테스트.
+    예) python -m test05.service_smoke
+    """
+    with tempfile.TemporaryDirectory(prefix="minute_smoke_") as work_dir:
+        failures = run_smoke(work_dir)
+    for failure in failures:
+        logging.error(f"스모크 테스트 실패: {failure}")
+    if failures:
+        return 1
+    print("스모크 테스트 통과")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
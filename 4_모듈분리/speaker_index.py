@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import logging
+import argparse
+import threading
+import numpy as np
+
+# 서비스 모드에서 여러 워커가 같은 색인 파일을 읽고 고쳐 쓰면서 등록 내용을 잃지 않도록 직렬화합니다.
+_INDEX_LOCK = threading.Lock()
+
+
+def _normalize(embeddings):
+    """
+    임베딩 행을 L2 정규화합니다. 내적이 곧 코사인 유사도가 됩니다.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if embeddings.ndim == 1:
+        embeddings = embeddings[np.newaxis, :]
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
+
+
+class SpeakerIndex:
+    """
+    회의 간에 공유되는 화자 임베딩 색인.
+    등록된 사람별 임베딩을 (N, D) float32 행렬 하나에 모아 .npz 파일로 저장합니다.
+    """
+
+    def __init__(self, embeddings=None, name_ids=None, names=None):
+        self.embeddings = embeddings if embeddings is not None else np.zeros((0, 0), dtype=np.float32)
+        self.name_ids = name_ids if name_ids is not None else np.zeros(0, dtype=np.int32)
+        self.names = list(names) if names is not None else []
+        self._name_to_id = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.name_ids)
+
+    @classmethod
+    def load(cls, path):
+        """
+        저장된 색인을 불러옵니다. 파일이 없으면 빈 색인을 반환합니다.
+        """
+        if not os.path.exists(path):
+            return cls()
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return cls(data["embeddings"], data["name_ids"], data["names"].tolist())
+        except (OSError, KeyError, ValueError) as e:
+            logging.error(f"화자 색인을 불러오는 중 오류 발생 ({path}): {e}")
+            return cls()
+
+    def save(self, path):
+        """
+        색인을 .npz 파일로 저장합니다.
+        """
+        index_dir = os.path.dirname(path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+        try:
+            # np.savez는 확장자가 없으면 .npz를 덧붙이므로 파일 객체로 저장합니다.
+            with open(path, "wb") as f:
+                np.savez(
+                    f,
+                    embeddings=self.embeddings,
+                    name_ids=self.name_ids,
+                    names=np.array(self.names, dtype=str),
+                )
+            logging.info(f"화자 색인을 '{path}'에 저장했습니다. (임베딩 {len(self)}개, 인물 {len(self.names)}명)")
+        except IOError as e:
+            logging.error(f"화자 색인 저장 중 오류 발생 ({path}): {e}")
+
+    def count(self, name):
+        """
+        한 사람에게 저장된 임베딩 수를 반환합니다.
+        """
+        if name not in self._name_to_id:
+            return 0
+        return int(np.count_nonzero(self.name_ids == self._name_to_id[name]))
+
+    def enroll(self, name, embeddings):
+        """
+        한 사람의 임베딩을 색인에 추가합니다. 기존 임베딩은 다시 계산하지 않습니다.
+        """
+        embeddings = _normalize(embeddings)
+        embeddings = embeddings[np.isfinite(embeddings).all(axis=1)]
+        if len(embeddings) == 0:
+            return
+        if name not in self._name_to_id:
+            self._name_to_id[name] = len(self.names)
+            self.names.append(name)
+        name_id = self._name_to_id[name]
+
+        if len(self) == 0:
+            self.embeddings = embeddings
+        else:
+            self.embeddings = np.vstack([self.embeddings, embeddings])
+        self.name_ids = np.concatenate([self.name_ids, np.full(len(embeddings), name_id, dtype=np.int32)])
+
+    def identify(self, embeddings, threshold):
+        """
+        새 화자 임베딩들을 등록된 사람과 비교합니다.
+        사람별 최대 코사인 유사도를 구한 뒤, 유사도가 높은 쌍부터 한 사람에 한 화자씩 배정합니다.
+        반환값은 입력 순서대로 (이름 또는 None, 유사도) 목록입니다.
+        """
+        embeddings = _normalize(embeddings)
+        matches = [(None, 0.0)] * len(embeddings)
+        if len(self) == 0 or len(embeddings) == 0:
+            return matches
+
+        similarities = np.nan_to_num(embeddings @ self.embeddings.T, nan=-1.0)
+        scores = np.full((len(self.names), len(embeddings)), -np.inf, dtype=np.float32)
+        np.maximum.at(scores, self.name_ids, similarities.T)
+        scores = scores.T
+
+        # 이미 배정된 사람은 다른 화자에게 다시 배정하지 않습니다.
+        assigned = set()
+        for flat in np.argsort(scores, axis=None)[::-1]:
+            speaker, person = np.unravel_index(flat, scores.shape)
+            score = float(scores[speaker, person])
+            if score < threshold:
+                break
+            if matches[speaker][0] is not None or person in assigned:
+                continue
+            matches[speaker] = (self.names[person], score)
+            assigned.add(person)
+        return matches
+
+
+def save_run_embeddings(path, labels, embeddings):
+    """
+    한 번의 실행에서 얻은 화자별 임베딩을 저장합니다. 나중에 이름을 붙여 등록할 때 사용합니다.
+    """
+    run_dir = os.path.dirname(path)
+    if run_dir:
+        os.makedirs(run_dir, exist_ok=True)
+    try:
+        with open(path, "wb") as f:
+            np.savez(f, labels=np.array(labels, dtype=str), embeddings=np.asarray(embeddings, dtype=np.float32))
+        logging.info(f"화자 임베딩을 '{path}'에 저장했습니다.")
+    except IOError as e:
+        logging.error(f"화자 임베딩 저장 중 오류 발생 ({path}): {e}")
+
+
+def identify_speakers(diarization, embeddings, index_path, threshold, auto_enroll_threshold=None, max_per_person=0):
+    """
+    화자 분리 결과의 익명 라벨(SPEAKER_00 등)을 등록된 이름으로 바꿉니다.
+    유사도가 auto_enroll_threshold 이상인 화자의 임베딩만 색인에 자동으로 추가하며,
+    한 사람당 max_per_person개까지만 저장합니다. 잘못 일치한 목소리가 색인에 쌓이지 않도록
+    auto_enroll_threshold는 식별 임계값보다 높게 두고, None이면 자동 등록하지 않습니다.
+    색인을 읽고 다시 저장하는 동안에는 같은 프로세스의 다른 작업이 색인을 고치지 못하게 잠급니다.
+    """
+    labels = diarization.labels()
+    mapping = {}
+    with _INDEX_LOCK:
+        index = SpeakerIndex.load(index_path)
+        matches = index.identify(embeddings, threshold)
+
+        enrolled = False
+        for label, embedding, (name, score) in zip(labels, embeddings, matches):
+            if name is None:
+                continue
+            logging.info(f"화자 식별: {label} -> {name} (유사도 {score:.3f})")
+            mapping[label] = name
+            if (auto_enroll_threshold is not None and score >= auto_enroll_threshold
+                    and index.count(name) < max_per_person):
+                index.enroll(name, embedding)
+                enrolled = True
+
+        if enrolled:
+            index.save(index_path)
+    if mapping:
+        diarization = diarization.rename_labels(mapping)
+    return diarization
+
+
+def main(argv=None):
+    """
+    화자 등록 CLI.
+    예) python -m test05.speaker_index enroll results/speakers_회의.npz SPEAKER_01 홍길동
+    """
+    from test05.config import SPEAKER_INDEX_PATH
+
+    parser = argparse.ArgumentParser(description="회의 간 화자 식별 색인을 관리합니다.")
+    parser.add_argument("--index", default=SPEAKER_INDEX_PATH, help="화자 색인 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enroll_parser = subparsers.add_parser("enroll", help="실행 결과의 화자를 이름으로 등록")
+    enroll_parser.add_argument("run_embeddings", help="실행 시 저장된 speakers_*.npz 파일")
+    enroll_parser.add_argument("label", help="등록할 화자 라벨 (예: SPEAKER_01)")
+    enroll_parser.add_argument("name", help="등록할 이름")
+
+    subparsers.add_parser("list", help="등록된 인물 목록 출력")
+    args = parser.parse_args(argv)
+
+    index = SpeakerIndex.load(args.index)
+    if args.command == "list":
+        counts = np.bincount(index.name_ids, minlength=len(index.names))
+        for name, count in zip(index.names, counts):
+            print(f"{name}: 임베딩 {count}개")
+        return 0
+
+    try:
+        with np.load(args.run_embeddings, allow_pickle=False) as data:
+            labels = data["labels"].tolist()
+            embeddings = data["embeddings"]
+    except (OSError, KeyError, ValueError) as e:
+        logging.error(f"화자 임베딩을 불러오는 중 오류 발생 ({args.run_embeddings}): {e}")
+        return 1
+    if args.label not in labels:
+        logging.error(f"'{args.run_embeddings}'에 화자 라벨 {args.label}이(가) 없습니다. (가능한 라벨: {', '.join(labels)})")
+        return 1
+
+    index.enroll(args.name, embeddings[labels.index(args.label)])
+    index.save(args.index)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import json
+import struct
+import logging
+import numpy as np
+
+# 바이너리 파일 형식
+#   헤더: 매직(4바이트) + 버전(uint16) + 세그먼트 수(uint32) + 화자 수(uint32) + 교정본 유무(uint8)
+#   열: starts(float64[n]), ends(float64[n]), speaker_ids(int32[n])
+#   문자열 표: 화자, 원본 텍스트, (교정 텍스트), 메타데이터(JSON) 순서로
+#             오프셋(uint32[k+1]) + UTF-8 바이트열
+_MAGIC = b"MNTR"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHIIB")
+
+
+def _pack_strings(strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    if encoded:
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets.tobytes() + b"".join(encoded)
+
+
+def _unpack_strings(data, position, count):
+    offsets = np.frombuffer(data, dtype="<u4", count=count + 1, offset=position)
+    position += offsets.nbytes
+    blob = data[position:position + int(offsets[-1])]
+    strings = [blob[start:end].decode("utf-8") for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+    return strings, position + len(blob)
+
+
+class Transcript:
+    """
+    화자 분리 + 음성 인식 결과를 열 단위로 보관하는 전사본.
+    시간(starts/ends)과 화자 ID 열은 원본과 교정본이 함께 쓰고, 화자 이름은 speakers 표에 한 번만 저장합니다.
+    """
+
+    def __init__(self, starts, ends, speaker_ids, speakers, texts, corrected_texts=None):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.speaker_ids = np.asarray(speaker_ids, dtype=np.int32)
+        self.speakers = list(speakers)
+        self.texts = list(texts)
+        self.corrected_texts = list(corrected_texts) if corrected_texts is not None else None
+
+    def __len__(self):
+        return len(self.texts)
+
+    @classmethod
+    def from_segments(cls, segments, corrected_segments=None):
+        """
+        기존 dict 세그먼트 목록({"start", "end", "speaker", "text"})에서 전사본을 만듭니다.
+        """
+        speaker_table = {}
+        speaker_ids = [speaker_table.setdefault(seg["speaker"], len(speaker_table)) for seg in segments]
+        corrected_texts = None
+        if corrected_segments is not None:
+            corrected_texts = [seg["text"] for seg in corrected_segments]
+        return cls(
+            [seg["start"] for seg in segments],
+            [seg["end"] for seg in segments],
+            speaker_ids,
+            list(speaker_table),
+            [seg["text"] for seg in segments],
+            corrected_texts,
+        )
+
+    def speaker_names(self):
+        """
+        세그먼트 순서대로 화자 이름 목록을 반환합니다.
+        """
+        return [self.speakers[i] for i in self.speaker_ids.tolist()]
+
+    def _iter_segments(self, texts):
+        for start, end, speaker, text in zip(self.starts.tolist(), self.ends.tolist(), self.speaker_names(), texts):
+            yield {"start": start, "end": end, "speaker": speaker, "text": text}
+
+    def original_segments(self):
+        """
+        원본 세그먼트를 기존 dict 형식으로 하나씩 돌려줍니다.
+        """
+        return self._iter_segments(self.texts)
+
+    def corrected_segments(self):
+        """
+        교정된 세그먼트를 기존 dict 형식으로 하나씩 돌려줍니다. 교정본이 없으면 원본을 돌려줍니다.
+        """
+        return self._iter_segments(self.corrected_texts if self.corrected_texts is not None else self.texts)
+
+    def save_binary(self, path, metadata=None):
+        """
+        전사본을 압축된 바이너리 형식으로 저장합니다. metadata(dict)는 JSON으로 함께 저장됩니다.
+        """
+        has_corrected = self.corrected_texts is not None
+        try:
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, len(self), len(self.speakers), int(has_corrected)))
+                f.write(self.starts.astype("<f8").tobytes())
+                f.write(self.ends.astype("<f8").tobytes())
+                f.write(self.speaker_ids.astype("<i4").tobytes())
+                f.write(_pack_strings(self.speakers))
+                f.write(_pack_strings(self.texts))
+                if has_corrected:
+                    f.write(_pack_strings(self.corrected_texts))
+                f.write(_pack_strings([json.dumps(metadata or {}, ensure_ascii=False)]))
+            return True
+        except IOError as e:
+            logging.error(f"파일 저장 중 오류 발생 ({path}): {e}")
+            return False
+
+    @classmethod
+    def load_binary(cls, path):
+        """
+        save_binary로 저장한 파일을 읽어 (전사본, 메타데이터)를 반환합니다. 실패하면 (None, None)을 반환합니다.
+        """
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, version, count, speaker_count, has_corrected = _HEADER.unpack_from(data, 0)
+            if magic != _MAGIC or version != _VERSION:
+                logging.error(f"지원하지 않는 전사본 파일 형식입니다: {path}")
+                return None, None
+
+            position = _HEADER.size
+            starts = np.frombuffer(data, dtype="<f8", count=count, offset=position)
+            position += starts.nbytes
+            ends = np.frombuffer(data, dtype="<f8", count=count, offset=position)
+            position += ends.nbytes
+            speaker_ids = np.frombuffer(data, dtype="<i4", count=count, offset=position)
+            position += speaker_ids.nbytes
+
+            speakers, position = _unpack_strings(data, position, speaker_count)
+            texts, position = _unpack_strings(data, position, count)
+            corrected_texts = None
+            if has_corrected:
+                corrected_texts, position = _unpack_strings(data, position, count)
+            (metadata_json,), position = _unpack_strings(data, position, 1)
+            return cls(starts, ends, speaker_ids, speakers, texts, corrected_texts), json.loads(metadata_json)
+        except (IOError, ValueError, struct.error) as e:
+            logging.error(f"전사본 파일을 읽는 중 오류 발생 ({path}): {e}")
+            return None, None